@@ -5,11 +5,11 @@ from PIL import Image
 from fpdf import FPDF
 import tempfile
 import os
-import preprocessor, helper
+import preprocessor, helper, dynamics, similarity, export
 import time
 import math
 import plotly.express as px
-from model import classify_tone
+from model import classify_tone, vectorize_messages
 
 st.set_page_config(
     page_title="WhatsApp Chat Analyzer",
@@ -83,6 +83,12 @@ def display_stats_value(final_value, duration=1.2, steps=60, unit=""):
 def load_and_preprocess(data):
     return preprocessor.preprocess(data)
 
+#cache_resource hands back the same objects instead of unpickling a copy on every rerun,
+#only the latest chats are kept so uploaded matrices are not pinned for the server lifetime
+@st.cache_resource(show_spinner="🧮 Vectorizing messages...", max_entries=2)
+def load_message_vectors(df):
+    return vectorize_messages(df)
+
 
 if data is not None:
     try:
@@ -103,6 +109,9 @@ if data is not None:
     user_list.insert(0, "Overall")
 
     selected_user = st.sidebar.selectbox("Show Analysis wrt", user_list)
+    export_format = st.sidebar.selectbox("Data export format", export.TABLE_FORMATS)
+    approximate_counts = st.sidebar.checkbox("Approximate word/emoji counts (huge chats)")
+    approximate_note = "ℹ️ Approximate mode: counts are lower bounds, each at most 0.1% of all counted items below the true count."
 
     if st.sidebar.button("Show Analysis"):
         progress = st.progress(0, text="🚀 Starting analysis...")
@@ -136,6 +145,15 @@ if data is not None:
         pdf.add_stat("Shared Media", media_message_count)
         pdf.add_stat("Shared Links", links_count)
 
+        #aggregates collected for the data export bundle
+        export_stats = {
+            'total_messages': num_messages,
+            'total_words': words,
+            'shared_media': media_message_count,
+            'shared_links': links_count
+        }
+        export_tables = {}
+
         st.title("Top Statistics")
         column1, column2, column3, column4 = st.columns(4)
         with column1:
@@ -154,6 +172,7 @@ if data is not None:
         #Monthly Timeline
         st.title("Monthly Timeline")
         timeline = helper.monthly_timeline(selected_user, df)
+        export_tables['monthly_timeline'] = timeline
         fig, ax = plt.subplots(figsize=(12, 6))
         fig.patch.set_facecolor('#f4f4f4')
         ax.set_facecolor('#f4f4f4')
@@ -175,6 +194,7 @@ if data is not None:
         #Daily Timeline
         st.title("Daily Timeline")
         daily_timeline = helper.daily_timeline(selected_user, df)
+        export_tables['daily_timeline'] = daily_timeline
         fig, ax = plt.subplots()
         ax.plot(daily_timeline['date_for_timeline'], daily_timeline['message'], color='#9b59b6')
         plt.xticks(rotation='vertical', color='#2c3e50')
@@ -194,6 +214,7 @@ if data is not None:
         with column1:
             st.header("Most Busy Day")
             busy_day = helper.week_activity_map(selected_user, df)
+            export_tables['week_activity'] = busy_day
             fig, ax = plt.subplots()
             ax.bar(busy_day.index, busy_day.values, color='#6c5ce7')
             plt.xticks(rotation=45, color='#2c3e50')
@@ -205,6 +226,7 @@ if data is not None:
         with column2:
             st.header("Most Busy Month")
             busy_month = helper.month_activity_map(selected_user, df)
+            export_tables['month_activity'] = busy_month
             fig, ax = plt.subplots()
             ax.bar(busy_month.index, busy_month.values, color='#6c5ce7')
             plt.xticks(rotation=45, color='#2c3e50')
@@ -216,6 +238,7 @@ if data is not None:
         #Weekly Activity Map
         st.title("Weekly Activity Map")
         user_heatmap = helper.activity_heatmap(selected_user, df)
+        export_tables['activity_heatmap'] = user_heatmap
         fig, ax = plt.subplots()
         ax = sns.heatmap(user_heatmap)
         st.pyplot(fig)
@@ -225,6 +248,7 @@ if data is not None:
         if selected_user == 'Overall':
             st.title("Most Engaged Users")
             x, new_df = helper.most_engaged_users(df)
+            export_tables['most_engaged_users'] = x
             fig, ax = plt.subplots()
             column1, column2 = st.columns(2)
             with column1:
@@ -237,6 +261,64 @@ if data is not None:
             with column2:
                 st.dataframe(new_df)
 
+        #Conversation dynamics
+        st.title("Conversation Dynamics")
+        session_df = dynamics.sessions(selected_user, df)
+        initiators = dynamics.conversation_initiators(selected_user, session_df)
+        streaks = dynamics.daily_streaks(selected_user, df)
+        longest_streak = int(streaks['days'].iloc[0]) if not streaks.empty else 0
+
+        pdf.add_stat("Conversations", session_df.shape[0])
+        pdf.add_stat("Conversations Started", int(initiators.sum()))
+        pdf.add_stat("Longest Daily Streak", f"{longest_streak} days")
+        export_stats['conversations'] = session_df.shape[0]
+        export_stats['conversations_started'] = int(initiators.sum())
+        export_stats['longest_daily_streak'] = longest_streak
+        export_tables['sessions'] = session_df
+        export_tables['conversation_initiators'] = initiators
+        export_tables['daily_streaks'] = streaks
+
+        column1, column2, column3 = st.columns(3)
+        with column1:
+            st.header("Conversations")
+            display_stats_value(session_df.shape[0])
+        with column2:
+            st.header("Conversations Started")
+            display_stats_value(int(initiators.sum()))
+        with column3:
+            st.header("Longest Streak")
+            display_stats_value(longest_streak, unit=" 🔥")
+
+        st.header("Reply Times")
+        replies = dynamics.reply_pairs(df)
+        reply_median = dynamics.median_reply_time(selected_user, replies)
+        reply_stats = dynamics.reply_time_stats(selected_user, replies)
+        export_tables['median_reply_time'] = reply_median
+        export_tables['reply_time_stats'] = reply_stats
+        column1, column2 = st.columns(2)
+        with column1:
+            fig, ax = plt.subplots()
+            ax.bar(reply_median.index, reply_median.values, color='#6c5ce7')
+            plt.xticks(rotation=45, color='#2c3e50')
+            ax.set_ylabel('Median Reply Time (minutes)')
+            save_plot(fig, "median_reply_time.png")
+            fig = helper.create_custom_activity_map(reply_median, "Median Reply Time", "Users", "Minutes", hover_label="Minutes")
+            st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+        with column2:
+            st.dataframe(reply_stats)
+
+        if selected_user == 'Overall':
+            st.header("Conversation Initiators")
+            fig, ax = plt.subplots()
+            ax.bar(initiators.index, initiators.values, color='#6c5ce7')
+            plt.xticks(rotation=45, color='#2c3e50')
+            save_plot(fig, "conversation_initiators.png")
+            fig = helper.create_custom_activity_map(initiators, "Conversation Initiators", "Users", "Conversations", hover_label="Conversations")
+            st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
+
+        st.header("Daily Streaks")
+        st.dataframe(streaks.head(10))
+
         #Wordcloud
         st.title("Wordcloud")
         df_wc = helper.create_wordcloud(selected_user, df)
@@ -247,19 +329,25 @@ if data is not None:
         save_plot(fig, "wordcloud.png")
 
         #Most common words
-        most_common_df = helper.most_common_words(selected_user, df)
+        most_common_df = helper.most_common_words(selected_user, df, approximate=approximate_counts)
+        export_tables['most_common_words'] = most_common_df
         fig, ax = plt.subplots()
         ax.barh(most_common_df[0], most_common_df[1])
         plt.xticks(rotation='vertical')
         st.title("Most Common Words")
+        if approximate_counts:
+            st.caption(approximate_note)
         #st.pyplot(fig)
         save_plot(fig, "most_common_words.png")
         fig = helper.create_custom_horizontal_bar(most_common_df, "Most Common Words")
         st.plotly_chart(fig, use_container_width=True, config={'displayModeBar': False})
 
         #Emoji analysis
-        emoji_df = helper.emoji_counting(selected_user, df)
+        emoji_df = helper.emoji_counting(selected_user, df, approximate=approximate_counts)
+        export_tables['emoji_counts'] = emoji_df
         st.title("Emoji Analysis")
+        if approximate_counts:
+            st.caption(approximate_note)
         column1, column2 = st.columns(2)
         with column1:
             st.dataframe(emoji_df)
@@ -270,9 +358,11 @@ if data is not None:
             save_plot(fig, "emoji_analysis.png")
 
         #Message Tone Classification
-        tone_df = classify_tone(df, selected_user)
+        message_vectors = load_message_vectors(df)
+        tone_df = classify_tone(df, selected_user, message_vectors)
 
         tone_counts = tone_df['chat_type'].value_counts()
+        export_tables['tone_counts'] = tone_counts
 
         st.title("Message Tone Analysis")
         st.markdown("### 🧪 Chat Tone Detection (Beta Feature)")
@@ -306,6 +396,24 @@ if data is not None:
             tone_counts_df.columns = ['Tone', 'Messages']
             st.dataframe(tone_counts_df)
 
+        #User similarity
+        if selected_user == 'Overall':
+            st.title("User Similarity")
+            users, centroids = similarity.user_centroids(message_vectors)
+
+            st.header("Vocabulary Similarity")
+            similarity_df = similarity.user_similarity(users, centroids)
+            export_tables['user_similarity'] = similarity_df
+            fig, ax = plt.subplots()
+            ax = sns.heatmap(similarity_df, vmin=0, vmax=1, cmap='Purples')
+            st.pyplot(fig)
+            save_plot(fig, "user_similarity.png")
+
+            st.header("Distinctive Terms")
+            terms_df = similarity.distinctive_terms(users, centroids)
+            export_tables['distinctive_terms'] = terms_df
+            st.dataframe(terms_df)
+
 
         #adding all saved plots to PDF
         for path in plot_paths:
@@ -321,3 +429,7 @@ if data is not None:
             st.download_button("📄 Download PDF Report", f, file_name="WhatsApp_Chat_Report.pdf")
 
         st.success("✅ PDF report generated!")
+
+        #structured data export, built in memory
+        bundle = export.build_bundle(selected_user, df, export_tables, export_stats, export_format)
+        st.download_button("📦 Download Data Export", bundle, file_name="WhatsApp_Chat_Data.zip", mime="application/zip")
@@ -0,0 +1,37 @@
+import heapq
+import math
+from collections import Counter
+
+#messages handled per pass, bounds the size of every intermediate token list
+CHUNK_SIZE = 10000
+
+def chunks(series, chunk_size=CHUNK_SIZE):
+    for start in range(0, len(series), chunk_size):
+        yield series.iloc[start:start + chunk_size]
+
+#top-k counter fed one chunk of counts at a time
+#approximate mode keeps a Misra-Gries summary (the mergeable form of Space-Saving):
+#at most ceil(1 / error) items are held and every count is a lower bound, off by at most error * total
+class TopKCounter:
+
+    def __init__(self, approximate=False, error=0.001):
+        if not 0 < error <= 1:
+            raise ValueError(f"error must be in (0, 1], got {error}")
+
+        self.approximate = approximate
+        self.capacity = math.ceil(1 / error)
+        self.total = 0
+        self._counter = Counter()
+
+    def update(self, counts):
+        self.total += sum(counts.values())
+        self._counter.update(counts)
+
+        #drop everything at or below the (capacity + 1)-th count, shift the survivors down by it
+        #rebuilt in insertion order, so ties keep breaking by first appearance as in exact mode
+        if self.approximate and len(self._counter) > self.capacity:
+            threshold = heapq.nlargest(self.capacity + 1, self._counter.values())[-1]
+            self._counter = Counter({item: count - threshold for item, count in self._counter.items() if count > threshold})
+
+    def most_common(self, n=None):
+        return self._counter.most_common(n)
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+#messages further apart than this start a new conversation
+SESSION_GAP_MINUTES = 60
+
+#a change of speaker later than this is a new topic rather than a reply, None keeps them all
+REPLY_CUTOFF_MINUTES = 7 * 24 * 60
+
+#sorted user messages as numpy arrays, everything below works on these with diff/shift
+def _chat_messages(df):
+    temp = df[df['user'] != 'group_notification']
+    if not temp['date'].is_monotonic_increasing:
+        temp = temp.sort_values('date', kind='mergesort')
+    return temp.reset_index(drop=True)
+
+def _session_ids(times, gap_minutes):
+    new_session = np.diff(times) > np.timedelta64(gap_minutes, 'm')
+    session_id = np.zeros(len(times), dtype=np.int64)
+    session_id[1:] = np.cumsum(new_session)
+    return session_id
+
+#every change of speaker within the cutoff counts as a reply
+def reply_pairs(df, reply_cutoff_minutes=REPLY_CUTOFF_MINUTES):
+    temp = _chat_messages(df)
+
+    users = temp['user'].to_numpy()
+    times = temp['date'].to_numpy()
+
+    minutes = np.diff(times) / np.timedelta64(1, 'm')
+    is_reply = users[1:] != users[:-1]
+    if reply_cutoff_minutes is not None:
+        is_reply &= minutes <= reply_cutoff_minutes
+
+    return pd.DataFrame({
+        'user': users[1:][is_reply],
+        'replied_to': users[:-1][is_reply],
+        'minutes': minutes[is_reply]
+    })
+
+#summaries below take the output of reply_pairs / sessions so each is computed once per render
+def reply_time_stats(selected_user, replies):
+    if selected_user != 'Overall':
+        replies = replies[replies['user'] == selected_user]
+
+    minutes = replies.groupby(['user', 'replied_to'])['minutes']
+    stats = minutes.agg(
+        replies='size',
+        median_minutes='median',
+        mean_minutes='mean'
+    )
+    stats['p90_minutes'] = minutes.quantile(0.9)
+
+    stats = stats.round(2).reset_index()
+
+    return stats.sort_values('replies', ascending=False).reset_index(drop=True)
+
+def median_reply_time(selected_user, replies):
+    if selected_user != 'Overall':
+        replies = replies[replies['user'] == selected_user]
+
+    return replies.groupby('user')['minutes'].median().round(2).sort_values()
+
+#conversations split on inactivity gaps, limited to the ones selected_user took part in
+def sessions(selected_user, df, gap_minutes=SESSION_GAP_MINUTES):
+    temp = _chat_messages(df)
+    temp['session'] = _session_ids(temp['date'].to_numpy(), gap_minutes)
+
+    session_df = temp.groupby('session').agg(
+        start=('date', 'first'),
+        end=('date', 'last'),
+        initiator=('user', 'first'),
+        messages=('message', 'size'),
+        participants=('user', 'nunique')
+    )
+
+    if selected_user != 'Overall':
+        session_df = session_df[session_df.index.isin(temp.loc[temp['user'] == selected_user, 'session'])]
+
+    session_df = session_df.assign(duration_minutes=(session_df['end'] - session_df['start']) / pd.Timedelta(minutes=1))
+
+    return session_df.reset_index(drop=True)
+
+def conversation_initiators(selected_user, session_df):
+    initiators = session_df['initiator'].value_counts()
+
+    if selected_user != 'Overall':
+        initiators = initiators[initiators.index == selected_user]
+
+    return initiators
+
+#runs of consecutive days with at least one message
+def daily_streaks(selected_user, df):
+    temp = _chat_messages(df)
+
+    if selected_user != 'Overall':
+        temp = temp[temp['user'] == selected_user]
+
+    days = temp['date'].to_numpy().astype('datetime64[D]')
+    if len(days):
+        days = days[np.r_[True, np.diff(days) != np.timedelta64(0, 'D')]]
+
+    new_streak = np.diff(days) != np.timedelta64(1, 'D')
+    streak_id = np.zeros(len(days), dtype=np.int64)
+    streak_id[1:] = np.cumsum(new_streak)
+
+    streaks = pd.DataFrame({'day': days, 'streak': streak_id}).groupby('streak')['day'].agg(
+        start='first',
+        end='last',
+        days='size'
+    )
+
+    return streaks.sort_values(['days', 'start'], ascending=[False, False]).reset_index(drop=True)
@@ -0,0 +1,113 @@
+import io
+import json
+import zipfile
+from datetime import datetime, timezone
+import pandas as pd
+
+#bump when a table is added, removed or its columns change
+SCHEMA_VERSION = 2
+
+TABLE_FORMATS = ('parquet', 'csv')
+
+#every table the bundle can hold, with its columns in order and their logical types
+SCHEMA = {
+    'messages': {
+        'date': 'datetime', 'user': 'string', 'message': 'string', 'date_for_timeline': 'date',
+        'year': 'int', 'month_num': 'int', 'month': 'string', 'day': 'int', 'day_name': 'string',
+        'hour': 'int', 'minutes': 'int', 'period': 'string',
+    },
+    'monthly_timeline': {'year': 'int', 'month_num': 'int', 'month': 'string', 'messages': 'int', 'time': 'string'},
+    'daily_timeline': {'date': 'date', 'messages': 'int'},
+    'week_activity': {'day_name': 'string', 'messages': 'int'},
+    'month_activity': {'month': 'string', 'messages': 'int'},
+    'activity_heatmap': {'day_name': 'string', 'period': 'string', 'messages': 'int'},
+    'most_engaged_users': {'user': 'string', 'messages': 'int'},
+    'sessions': {
+        'start': 'datetime', 'end': 'datetime', 'initiator': 'string', 'messages': 'int',
+        'participants': 'int', 'duration_minutes': 'float',
+    },
+    'conversation_initiators': {'user': 'string', 'conversations': 'int'},
+    'daily_streaks': {'start': 'date', 'end': 'date', 'days': 'int'},
+    'median_reply_time': {'user': 'string', 'median_minutes': 'float'},
+    'reply_time_stats': {
+        'user': 'string', 'replied_to': 'string', 'replies': 'int',
+        'median_minutes': 'float', 'mean_minutes': 'float', 'p90_minutes': 'float',
+    },
+    'most_common_words': {'word': 'string', 'count': 'int'},
+    'emoji_counts': {'emoji': 'string', 'count': 'int'},
+    'tone_counts': {'tone': 'string', 'messages': 'int'},
+    'user_similarity': {'user': 'string', 'other_user': 'string', 'similarity': 'float'},
+    'distinctive_terms': {'user': 'string', 'distinctive_terms': 'string'},
+}
+
+CASTS = {'int': 'int64', 'float': 'float64'}
+
+#wide pivots whose columns depend on the chat go out in long form
+def _long_form(name, data):
+    if name == 'activity_heatmap':
+        return data.stack().rename('messages').reset_index()
+    if name == 'user_similarity':
+        return data.rename_axis(index='user', columns='other_user').stack().rename('similarity').reset_index()
+    return data
+
+def _as_frame(name, data):
+    if name not in SCHEMA:
+        raise ValueError(f"Unknown export table: {name}")
+    columns = list(SCHEMA[name])
+
+    data = _long_form(name, data)
+    if isinstance(data, pd.Series) or not isinstance(data.index, pd.RangeIndex):
+        data = data.reset_index()
+
+    #named columns are picked by name, positional ones (e.g. most_common_words' 0 and 1) renamed in order
+    if data.shape[1] == 0:
+        data = pd.DataFrame(columns=columns)
+    elif set(columns) <= set(data.columns):
+        data = data[columns]
+    elif data.shape[1] == len(columns):
+        data = data.set_axis(columns, axis=1)
+    else:
+        raise ValueError(f"{name} has columns {list(data.columns)}, expected {columns}")
+
+    return data.astype({col: CASTS[kind] for col, kind in SCHEMA[name].items() if kind in CASTS})
+
+def _encode(frame, table_format):
+    if table_format == 'parquet':
+        buffer = io.BytesIO()
+        frame.to_parquet(buffer, index=False)
+        return buffer.getvalue()
+    return frame.to_csv(index=False).encode('utf-8')
+
+#zip bundle of the preprocessed chat plus every aggregate, built in memory
+def build_bundle(selected_user, df, tables, stats, table_format='parquet'):
+    if table_format not in TABLE_FORMATS:
+        raise ValueError(f"Unsupported table format: {table_format}")
+
+    manifest = {
+        'schema_version': SCHEMA_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'selected_user': selected_user,
+        'table_format': table_format,
+        'stats': 'stats.json',
+        'tables': {},
+    }
+
+    if selected_user != 'Overall':
+        df = df[df['user'] == selected_user]
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as bundle:
+        for name, data in {'messages': df, **tables}.items():
+            frame = _as_frame(name, data)
+            path = f"{name}.{table_format}"
+            bundle.writestr(path, _encode(frame, table_format))
+            manifest['tables'][name] = {
+                'path': path,
+                'rows': int(frame.shape[0]),
+                'columns': SCHEMA[name],
+            }
+
+        bundle.writestr('stats.json', json.dumps(stats, indent=2, default=str))
+        bundle.writestr('manifest.json', json.dumps(manifest, indent=2))
+
+    return buffer.getvalue()
@@ -3,6 +3,7 @@ from wordcloud import WordCloud
 import pandas as pd
 from collections import Counter
 import emoji
+from counting import TopKCounter, chunks
 
 extractor = URLExtract()
 
@@ -64,7 +65,7 @@ def create_wordcloud(selected_user, df):
 
     return df_wc
 
-def most_common_words(selected_user, df):
+def most_common_words(selected_user, df, approximate=False, error=0.001):
 
     f = open('stop_hinglish.txt','r')
     stop_words = f.read()
@@ -75,24 +76,25 @@ def most_common_words(selected_user, df):
     temp = df[df['user'] != 'group_notification']
     temp = temp[temp['message'] != '<Media omitted>\n']
 
-    words = []
-
-    for message in temp['message']:
-        for word in message.lower().split():
-            if word not in stop_words:
-                words.append(word)
+    #count chunk by chunk so only one chunk of tokens is alive at a time
+    counter = TopKCounter(approximate, error)
+    for chunk in chunks(temp['message']):
+        words = chunk.str.lower().str.split().explode().dropna().value_counts(sort=False)
+        counter.update({word: count for word, count in zip(words.index, words.tolist()) if word not in stop_words})
 
-    most_common_df = pd.DataFrame(Counter(words).most_common(20))
+    most_common_df = pd.DataFrame(counter.most_common(20))
     return most_common_df
 
-def emoji_counting(selected_user, df):
+def emoji_counting(selected_user, df, approximate=False, error=0.001):
     if selected_user != 'Overall':
         df = df[df['user'] == selected_user]
 
-    emojis = []
-    for message in df['message']:
-        emojis.extend([c for c in message if c in emoji.UNICODE_EMOJI['en']])
-    emoji_df = pd.DataFrame(Counter(emojis).most_common(len(Counter(emojis))))
+    counter = TopKCounter(approximate, error)
+    for chunk in chunks(df['message']):
+        chars = Counter(chunk.str.cat())
+        counter.update({c: count for c, count in chars.items() if c in emoji.UNICODE_EMOJI['en']})
+
+    emoji_df = pd.DataFrame(counter.most_common())
     return emoji_df
 
 def monthly_timeline(selected_user, df):
@@ -140,7 +142,7 @@ def activity_heatmap(selected_user,df):
     return user_heatmap
 
 
-def create_custom_plotly_line(timeline_df, x_col, y_col, title, xlabel, ylabel):
+def create_custom_plotly_line(timeline_df, x_col, y_col, title, xlabel, ylabel, hover_label='Messages'):
     import plotly.graph_objects as go
 
     x_vals = timeline_df[x_col]
@@ -154,7 +156,7 @@ def create_custom_plotly_line(timeline_df, x_col, y_col, title, xlabel, ylabel):
         mode='lines+markers',
         line=dict(color='#9b59b6'),
         marker=dict(symbol='circle', size=8, color='#9b59b6'),
-        hovertemplate='%{x}<br>Messages: %{y}<extra></extra>'
+        hovertemplate=f'%{{x}}<br>{hover_label}: %{{y}}<extra></extra>'
     ))
 
     fig.update_layout(
@@ -189,7 +191,7 @@ def create_custom_plotly_line(timeline_df, x_col, y_col, title, xlabel, ylabel):
 
     return fig
 
-def create_custom_plotly_daily_line(timeline_df, x_col, y_col, title, xlabel, ylabel):
+def create_custom_plotly_daily_line(timeline_df, x_col, y_col, title, xlabel, ylabel, hover_label='Messages'):
     import plotly.graph_objects as go
 
     fig = go.Figure()
@@ -199,7 +201,7 @@ def create_custom_plotly_daily_line(timeline_df, x_col, y_col, title, xlabel, yl
         y=timeline_df[y_col],
         mode='lines',
         line=dict(color='#9b59b6'),
-        hovertemplate='%{x}<br>Messages: %{y}<extra></extra>'
+        hovertemplate=f'%{{x}}<br>{hover_label}: %{{y}}<extra></extra>'
     ))
 
     fig.update_layout(
@@ -236,7 +238,7 @@ def create_custom_plotly_daily_line(timeline_df, x_col, y_col, title, xlabel, yl
     return fig
 
 
-def create_custom_activity_map(data_series, title, xlabel, ylabel):
+def create_custom_activity_map(data_series, title, xlabel, ylabel, hover_label='Messages'):
     import plotly.graph_objects as go
 
     fig = go.Figure()
@@ -245,7 +247,7 @@ def create_custom_activity_map(data_series, title, xlabel, ylabel):
         x=data_series.index,
         y=data_series.values,
         marker=dict(color='#6c5ce7'),
-        hovertemplate='%{x}<br>Messages: %{y}<extra></extra>'
+        hovertemplate=f'%{{x}}<br>{hover_label}: %{{y}}<extra></extra>'
     ))
 
     fig.update_layout(
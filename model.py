@@ -15,15 +15,23 @@ label_map = {
     "casual": "Casual 😁"
 }
 
-def classify_tone(df, selected_user):
+#tf-idf matrix of the whole chat, row i belongs to message i of the returned frame
+def vectorize_messages(df):
+    messages = df['message'].astype(str).str.lower().fillna('').str.strip()
+    df = df.assign(message=messages)[messages != '']
 
-    if selected_user != "Overall":
-        df = df[df['user'] == selected_user]
+    return df, tfidf.transform(df['message'])
+
+def classify_tone(df, selected_user, message_vectors=None):
 
-    df['message'] = df['message'].astype(str).str.lower().fillna('').str.strip()
-    df = df[df['message'] != '']
+    if message_vectors is None:
+        message_vectors = vectorize_messages(df)
+    df, tfidf_input = message_vectors
+
+    if selected_user != "Overall":
+        mask = (df['user'] == selected_user).to_numpy()
+        df, tfidf_input = df[mask], tfidf_input[mask]
 
-    tfidf_input = tfidf.transform(df['message'])
     predictions = model.predict(tfidf_input)
     predicted_labels = [label_map.get(pred, "Unknown") for pred in predictions]
 
@@ -38,5 +46,4 @@ def classify_tone(df, selected_user):
         else:
             updated_labels.append(label)
 
-    df['chat_type'] = updated_labels
-    return df
+    return df.assign(chat_type=updated_labels)
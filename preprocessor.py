@@ -1,37 +1,90 @@
 import re
 import pandas as pd
-from datetime import datetime
+from collections import namedtuple
+from functools import lru_cache
 
-def preprocess(data):
-    pattern_am_pm = re.compile(
-        r'^(\d{1,2}/\d{1,2}/\d{2,4}),\s*'
-        r'(\d{1,2}:\d{2})\s*'
-        r'([AaPp][Mm])\s*-\s*'
-        , re.MULTILINE
-    )
+#only the start of the file is looked at to pick the timestamp format
+SAMPLE_SIZE = 4096
+
+TimestampFormat = namedtuple('TimestampFormat', ['name', 'pattern', 'separator', 'twelve_hour', 'day_first', 'four_digit_year', 'seconds'])
+
+def _stamp(sep, twelve_hour):
+    sep = re.escape(sep)
+    stamp = rf'\d{{1,2}}{sep}\d{{1,2}}{sep}\d{{2,4}},?\s\d{{1,2}}:\d{{2}}(?::\d{{2}})?'
+    if twelve_hour:
+        stamp += r'\s?[AaPp]\.?\s?[Mm]\.?'
+    return stamp
+
+#android exports look like "12/07/20, 19:53 - ", ios exports like "[12/07/2020, 19:53:10] "
+_LAYOUTS = {
+    'android': r'^\u200e?({stamp})\s-\s',
+    'ios': r'^\u200e?\[({stamp})\]\s',
+}
+
+#every supported header, compiled once; each has a single group holding the timestamp
+FORMATS = [
+    (f"{layout}_{'12h' if twelve_hour else '24h'}_{sep_name}", re.compile(template.format(stamp=_stamp(sep, twelve_hour)), re.MULTILINE), sep, twelve_hour)
+    for layout, template in _LAYOUTS.items()
+    for twelve_hour in (False, True)
+    for sep, sep_name in (('/', 'slash'), ('.', 'dot'), ('-', 'dash'))
+]
 
-    def convert_match(m):
-        date_str, time_str, am_pm = m.groups()
-        for fmt in ("%d/%m/%y %I:%M %p", "%d/%m/%Y %I:%M %p"):
-            try:
-                dt_obj = datetime.strptime(f"{date_str} {time_str} {am_pm.upper()}", fmt)
-                return dt_obj.strftime("%d/%m/%y, %H:%M - ")
-            except ValueError:
-                continue
-        return m.group(0)
+#day/month order, year width and seconds are read off the sampled timestamps
+@lru_cache(maxsize=32)
+def detect_format(sample):
+    best = None
+    best_stamps = []
+    for name, pattern, sep, twelve_hour in FORMATS:
+        stamps = pattern.findall(sample)
+        if len(stamps) > len(best_stamps):
+            best = (name, pattern, sep, twelve_hour)
+            best_stamps = stamps
 
-    data = pattern_am_pm.sub(convert_match, data)
+    if best is None:
+        return None
 
-    pattern_24hr = r'\d{1,2}/\d{1,2}/\d{2,4},\s\d{1,2}:\d{2}\s-\s'
+    fields = [re.findall(r'\d+', stamp) for stamp in best_stamps]
+    if any(int(f[0]) > 12 for f in fields):
+        day_first = True
+    elif any(int(f[1]) > 12 for f in fields):
+        day_first = False
+    else:
+        day_first = None
+
+    return TimestampFormat(
+        *best,
+        day_first=day_first,
+        four_digit_year=len(fields[0][2]) == 4,
+        seconds=len(fields[0]) > 5
+    )
+
+def _datetime_format(fmt, day_first):
+    day_month = ('%d', '%m') if day_first else ('%m', '%d')
+    date_part = fmt.separator.join([*day_month, '%Y' if fmt.four_digit_year else '%y'])
+    time_part = ('%I' if fmt.twelve_hour else '%H') + ':%M' + (':%S' if fmt.seconds else '')
+    return f"{date_part} {time_part}" + (' %p' if fmt.twelve_hour else '')
+
+def preprocess(data):
+    fmt = detect_format(data[:SAMPLE_SIZE])
+    if fmt is None:
+        return pd.DataFrame(columns=['date', 'user', 'message'])
 
-    messages = re.split(pattern_24hr, data)[1:]
-    dates = re.findall(pattern_24hr, data)
+    parts = fmt.pattern.split(data)
+    dates = pd.Series(parts[1::2], dtype=object)
+    messages = parts[2::2]
 
-    df = pd.DataFrame({'user_message': messages, 'message_date': dates})
+    #"7:53 p.m." -> "7:53 PM", commas and odd spaces collapsed to a single space
+    dates = dates.str.replace(r',?\s+', ' ', regex=True)
+    if fmt.twelve_hour:
+        dates = dates.str.replace(r'\s?([AaPp])\.?\s?[Mm]\.?$', r' \1M', regex=True).str.upper()
 
-    df['message_date'] = pd.to_datetime(df['message_date'], format='%d/%m/%y, %H:%M - ')
+    #ambiguous sample (every day <= 12): settle the order on the whole chat
+    day_first = fmt.day_first
+    if day_first is None:
+        leading = dates.str.extract(r'^(\d+)\D(\d+)').astype(int)
+        day_first = not (leading[1] > 12).any()
 
-    df.rename(columns={'message_date': 'date'}, inplace=True)
+    df = pd.DataFrame({'user_message': messages, 'date': pd.to_datetime(dates, format=_datetime_format(fmt, day_first))})
 
     users = []
     messages = []
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.preprocessing import normalize
+from model import tfidf
+
+#mean tf-idf vector per user, built as (membership matrix / counts) @ tf-idf matrix
+def user_centroids(message_vectors):
+    df, tfidf_input = message_vectors
+
+    keep = ((df['user'] != 'group_notification') & (df['message'] != '<media omitted>')).to_numpy()
+    codes, users = pd.factorize(df['user'][keep], sort=True)
+
+    n = len(codes)
+    membership = sparse.csr_matrix((np.ones(n), (codes, np.arange(n))), shape=(len(users), n))
+    counts = np.asarray(membership.sum(axis=1)).ravel()
+
+    centroids = sparse.diags(1 / counts) @ membership @ tfidf_input[keep]
+
+    return list(users), centroids.tocsr()
+
+#cosine similarity of every pair of user centroids
+def user_similarity(users, centroids):
+    unit = normalize(centroids)
+    similarity = (unit @ unit.T).toarray()
+
+    return pd.DataFrame(similarity.round(3), index=users, columns=users)
+
+#terms a user leans on more than the average user (unweighted mean of the centroids)
+def distinctive_terms(users, centroids, top_n=10):
+    terms = tfidf.get_feature_names_out()
+    average_user = np.asarray(centroids.mean(axis=0)).ravel()
+
+    rows = []
+    for i, user in enumerate(users):
+        start, end = centroids.indptr[i], centroids.indptr[i + 1]
+        indices = centroids.indices[start:end]
+        scores = centroids.data[start:end] - average_user[indices]
+
+        top = np.argsort(scores)[::-1][:top_n]
+        top = top[scores[top] > 0]
+
+        rows.append({'user': user, 'distinctive_terms': ", ".join(terms[indices[top]])})
+
+    return pd.DataFrame(rows, columns=['user', 'distinctive_terms'])
@@ -0,0 +1,60 @@
+import random
+from collections import Counter
+import pytest
+from counting import TopKCounter
+
+#zipf-like stream split into chunks of per-item counts, as helper feeds the counter
+def make_chunks(n_chunks=20, chunk_tokens=2000, vocabulary=5000, seed=0):
+    rng = random.Random(seed)
+    items = [f"w{i}" for i in range(vocabulary)]
+    weights = [1 / (i + 1) for i in range(vocabulary)]
+    return [Counter(rng.choices(items, weights=weights, k=chunk_tokens)) for _ in range(n_chunks)]
+
+def feed(counter, chunks):
+    truth = Counter()
+    for chunk in chunks:
+        counter.update(dict(chunk))
+        truth.update(chunk)
+    return truth
+
+def test_exact_mode_matches_counter():
+    counter = TopKCounter()
+    truth = feed(counter, make_chunks())
+
+    assert counter.most_common() == truth.most_common()
+    assert counter.most_common(20) == truth.most_common(20)
+    assert counter.total == sum(truth.values())
+
+def test_exact_mode_keeps_first_seen_tie_order():
+    counter = TopKCounter()
+    counter.update({'b': 1, 'a': 1})
+    counter.update({'c': 1})
+
+    assert counter.most_common() == [('b', 1), ('a', 1), ('c', 1)]
+
+def test_approximate_matches_exact_without_eviction():
+    chunks = [{'b': 2, 'a': 2}, {'c': 1, 'a': 1}]
+    exact, approximate = TopKCounter(), TopKCounter(approximate=True, error=0.1)
+    feed(exact, chunks)
+    feed(approximate, chunks)
+
+    assert approximate.most_common() == exact.most_common()
+
+@pytest.mark.parametrize('error', [0.1, 0.01, 0.002])
+def test_approximate_is_bounded(error):
+    counter = TopKCounter(approximate=True, error=error)
+    truth = Counter()
+    for chunk in make_chunks():
+        counter.update(dict(chunk))
+        truth.update(chunk)
+        assert len(counter.most_common()) <= counter.capacity
+
+    estimates = dict(counter.most_common())
+    for item, count in truth.items():
+        estimate = estimates.get(item, 0)
+        assert count - error * counter.total <= estimate <= count
+
+@pytest.mark.parametrize('error', [0, -0.5, 1.5])
+def test_invalid_error(error):
+    with pytest.raises(ValueError):
+        TopKCounter(approximate=True, error=error)
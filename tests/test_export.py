@@ -0,0 +1,87 @@
+import io
+import json
+import zipfile
+import pandas as pd
+import pytest
+import preprocessor, helper, dynamics, similarity, export
+from model import classify_tone, vectorize_messages
+
+def load_chat():
+    with open('sample_chat.txt', 'r', encoding='utf-8') as f:
+        return preprocessor.preprocess(f.read())
+
+#the same aggregates app.py collects for the export
+def collect_tables(selected_user, df):
+    session_df = dynamics.sessions(selected_user, df)
+    replies = dynamics.reply_pairs(df)
+    message_vectors = vectorize_messages(df)
+    users, centroids = similarity.user_centroids(message_vectors)
+
+    return {
+        'monthly_timeline': helper.monthly_timeline(selected_user, df),
+        'daily_timeline': helper.daily_timeline(selected_user, df),
+        'week_activity': helper.week_activity_map(selected_user, df),
+        'month_activity': helper.month_activity_map(selected_user, df),
+        'activity_heatmap': helper.activity_heatmap(selected_user, df),
+        'most_engaged_users': helper.most_engaged_users(df)[0],
+        'sessions': session_df,
+        'conversation_initiators': dynamics.conversation_initiators(selected_user, session_df),
+        'daily_streaks': dynamics.daily_streaks(selected_user, df),
+        'median_reply_time': dynamics.median_reply_time(selected_user, replies),
+        'reply_time_stats': dynamics.reply_time_stats(selected_user, replies),
+        'most_common_words': helper.most_common_words(selected_user, df),
+        'emoji_counts': helper.emoji_counting(selected_user, df),
+        'tone_counts': classify_tone(df, selected_user, message_vectors)['chat_type'].value_counts(),
+        'user_similarity': similarity.user_similarity(users, centroids),
+        'distinctive_terms': similarity.distinctive_terms(users, centroids),
+    }
+
+def read_table(bundle, info, table_format):
+    data = io.BytesIO(bundle.read(info['path']))
+    return pd.read_parquet(data) if table_format == 'parquet' else pd.read_csv(data)
+
+@pytest.mark.parametrize('table_format', export.TABLE_FORMATS)
+@pytest.mark.parametrize('selected_user', ['Overall', 'Alex Morgan'])
+def test_bundle_matches_schema(selected_user, table_format):
+    df = load_chat()
+    content = export.build_bundle(selected_user, df, collect_tables(selected_user, df), {'total_messages': 1}, table_format)
+
+    bundle = zipfile.ZipFile(io.BytesIO(content))
+    manifest = json.loads(bundle.read('manifest.json'))
+
+    assert manifest['schema_version'] == export.SCHEMA_VERSION
+    assert set(manifest['tables']) == set(export.SCHEMA)
+    assert json.loads(bundle.read('stats.json')) == {'total_messages': 1}
+
+    for name, info in manifest['tables'].items():
+        assert info['columns'] == export.SCHEMA[name]
+        frame = read_table(bundle, info, table_format)
+        assert list(frame.columns) == list(export.SCHEMA[name])
+        assert len(frame) == info['rows']
+
+def test_long_form_tables():
+    df = load_chat()
+    tables = collect_tables('Overall', df)
+
+    heatmap = export._as_frame('activity_heatmap', tables['activity_heatmap'])
+    assert heatmap['messages'].sum() == tables['activity_heatmap'].to_numpy().sum()
+
+    similarity_df = export._as_frame('user_similarity', tables['user_similarity'])
+    assert len(similarity_df) == len(tables['user_similarity']) ** 2
+
+def test_member_named_like_a_column():
+    similarity_df = pd.DataFrame([[1.0, 0.5], [0.5, 1.0]], index=['user', 'other_user'], columns=['user', 'other_user'])
+
+    frame = export._as_frame('user_similarity', similarity_df)
+    assert frame.to_dict('records') == [
+        {'user': 'user', 'other_user': 'user', 'similarity': 1.0},
+        {'user': 'user', 'other_user': 'other_user', 'similarity': 0.5},
+        {'user': 'other_user', 'other_user': 'user', 'similarity': 0.5},
+        {'user': 'other_user', 'other_user': 'other_user', 'similarity': 1.0},
+    ]
+
+def test_unknown_table_and_format():
+    with pytest.raises(ValueError):
+        export.build_bundle('Overall', load_chat(), {'not_a_table': pd.DataFrame()}, {})
+    with pytest.raises(ValueError):
+        export.build_bundle('Overall', load_chat(), {}, {}, 'xlsx')
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+import preprocessor
+
+#one chat per row of preprocessor.FORMATS, all holding the same two messages
+FORMAT_CASES = {
+    'android_24h_slash': "24/07/20, 14:08 - Alex Morgan: Great. See you then!\n25/07/20, 09:05 - Jamie Rivera: Morning\n",
+    'android_24h_dot': "24.07.20, 14:08 - Alex Morgan: Great. See you then!\n25.07.20, 09:05 - Jamie Rivera: Morning\n",
+    'android_24h_dash': "24-07-20, 14:08 - Alex Morgan: Great. See you then!\n25-07-20, 09:05 - Jamie Rivera: Morning\n",
+    'android_12h_slash': "24/07/20, 2:08 pm - Alex Morgan: Great. See you then!\n25/07/20, 9:05 am - Jamie Rivera: Morning\n",
+    'android_12h_dot': "24.07.20, 2:08 PM - Alex Morgan: Great. See you then!\n25.07.20, 9:05 AM - Jamie Rivera: Morning\n",
+    'android_12h_dash': "24-07-20, 2:08 pm - Alex Morgan: Great. See you then!\n25-07-20, 9:05 am - Jamie Rivera: Morning\n",
+    'ios_24h_slash': "[24/07/2020, 14:08:00] Alex Morgan: Great. See you then!\n[25/07/2020, 09:05:00] Jamie Rivera: Morning\n",
+    'ios_24h_dot': "[24.07.2020, 14:08:00] Alex Morgan: Great. See you then!\n[25.07.2020, 09:05:00] Jamie Rivera: Morning\n",
+    'ios_24h_dash': "[24-07-2020, 14:08:00] Alex Morgan: Great. See you then!\n[25-07-2020, 09:05:00] Jamie Rivera: Morning\n",
+    'ios_12h_slash': "[24/07/2020, 2:08:00 PM] Alex Morgan: Great. See you then!\n[25/07/2020, 9:05:00 AM] Jamie Rivera: Morning\n",
+    'ios_12h_dot': "[24.07.2020, 2:08:00 PM] Alex Morgan: Great. See you then!\n[25.07.2020, 9:05:00 AM] Jamie Rivera: Morning\n",
+    'ios_12h_dash': "[24-07-2020, 2:08:00 PM] Alex Morgan: Great. See you then!\n[25-07-2020, 9:05:00 AM] Jamie Rivera: Morning\n",
+}
+
+EXPECTED_DATES = [pd.Timestamp('2020-07-24 14:08'), pd.Timestamp('2020-07-25 09:05')]
+EXPECTED_USERS = ['Alex Morgan', 'Jamie Rivera']
+EXPECTED_MESSAGES = ['Great. See you then!\n', 'Morning\n']
+
+def assert_chat(df, dates=EXPECTED_DATES, users=EXPECTED_USERS, messages=EXPECTED_MESSAGES):
+    assert df['date'].tolist() == dates
+    assert df['user'].tolist() == users
+    assert df['message'].tolist() == messages
+
+def test_every_format_has_a_case():
+    assert sorted(name for name, *_ in preprocessor.FORMATS) == sorted(FORMAT_CASES)
+
+@pytest.mark.parametrize('name', FORMAT_CASES)
+def test_format_variants(name):
+    data = FORMAT_CASES[name]
+
+    assert preprocessor.detect_format(data[:preprocessor.SAMPLE_SIZE]).name == name
+    assert_chat(preprocessor.preprocess(data))
+
+def test_us_month_first():
+    data = "7/24/20, 2:08 PM - Alex Morgan: Great. See you then!\n7/25/20, 9:05 AM - Jamie Rivera: Morning\n"
+
+    assert preprocessor.detect_format(data).day_first is False
+    assert_chat(preprocessor.preprocess(data))
+
+def test_locale_am_pm_markers():
+    data = "24/07/20, 2:08 p.m. - Alex Morgan: Great. See you then!\n25/07/20, 9:05 a.m. - Jamie Rivera: Morning\n"
+
+    assert_chat(preprocessor.preprocess(data))
+
+def test_narrow_no_break_space_before_am_pm():
+    data = "24/07/20, 2:08\u202fpm - Alex Morgan: Great. See you then!\n25/07/20, 9:05\u202fam - Jamie Rivera: Morning\n"
+
+    assert_chat(preprocessor.preprocess(data))
+
+def test_seconds():
+    data = "[24/07/2020, 14:08:37] Alex Morgan: Great. See you then!\n[25/07/2020, 09:05:12] Jamie Rivera: Morning\n"
+
+    fmt = preprocessor.detect_format(data)
+    assert fmt.seconds and fmt.four_digit_year
+    assert_chat(
+        preprocessor.preprocess(data),
+        dates=[pd.Timestamp('2020-07-24 14:08:37'), pd.Timestamp('2020-07-25 09:05:12')]
+    )
+
+def test_ambiguous_sample_settled_on_whole_chat():
+    #every date in the sample has day and month <= 12, the month-first hint comes after it
+    filler = "more text\n" * (preprocessor.SAMPLE_SIZE // 10 + 1)
+    data = (
+        "1/2/24, 9:05 PM - Alex Morgan: hi\n" + filler +
+        "1/13/24, 10:00 AM - Jamie Rivera: Morning\n"
+    )
+
+    assert preprocessor.detect_format(data[:preprocessor.SAMPLE_SIZE]).day_first is None
+    assert_chat(
+        preprocessor.preprocess(data),
+        dates=[pd.Timestamp('2024-01-02 21:05'), pd.Timestamp('2024-01-13 10:00')],
+        messages=['hi\n' + filler, 'Morning\n']
+    )
+
+def test_ambiguous_chat_defaults_to_day_first():
+    data = "1/2/24, 21:05 - Alex Morgan: hi\n3/4/24, 10:00 - Jamie Rivera: Morning\n"
+
+    assert_chat(
+        preprocessor.preprocess(data),
+        dates=[pd.Timestamp('2024-02-01 21:05'), pd.Timestamp('2024-04-03 10:00')],
+        messages=['hi\n', 'Morning\n']
+    )
+
+def test_group_notification_and_multiline_message():
+    data = (
+        "12/07/20, 19:53 - Messages and calls are end-to-end encrypted.\n"
+        "24/07/20, 14:08 - Alex Morgan: first line\nsecond line\n"
+    )
+
+    df = preprocessor.preprocess(data)
+    assert df['user'].tolist() == ['group_notification', 'Alex Morgan']
+    assert df['message'].tolist() == ['Messages and calls are end-to-end encrypted.\n', 'first line\nsecond line\n']
+
+def test_not_a_chat():
+    assert preprocessor.preprocess("hello world").empty
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import similarity
+from model import tfidf, vectorize_messages
+
+def make_chat():
+    return pd.DataFrame({
+        'user': ['Alex', 'Jamie', 'Alex', 'group_notification', 'Sam', 'Jamie', 'Alex', 'Sam'],
+        'message': [
+            'Pizza tonight?\n',
+            'Sure, what time?\n',
+            'Seven works for pizza\n',
+            'Sam joined\n',
+            '<Media omitted>\n',
+            'See you then\n',
+            'Great, see you\n',
+            'Great pizza, see you soon\n',
+        ],
+    })
+
+def test_centroid_is_users_mean_tfidf_row():
+    df = make_chat()
+    users, centroids = similarity.user_centroids(vectorize_messages(df))
+
+    assert users == ['Alex', 'Jamie', 'Sam']
+    for i, user in enumerate(users):
+        messages = df.loc[df['user'] == user, 'message'].str.lower().str.strip()
+        messages = messages[messages != '<media omitted>']
+        expected = np.asarray(tfidf.transform(messages).mean(axis=0)).ravel()
+        np.testing.assert_allclose(centroids[i].toarray().ravel(), expected)
+
+def test_similarity_is_symmetric_with_unit_diagonal():
+    users, centroids = similarity.user_centroids(vectorize_messages(make_chat()))
+    similarity_df = similarity.user_similarity(users, centroids)
+
+    assert list(similarity_df.index) == users and list(similarity_df.columns) == users
+    np.testing.assert_allclose(similarity_df.to_numpy(), similarity_df.to_numpy().T)
+    np.testing.assert_allclose(np.diag(similarity_df.to_numpy()), 1)
+
+def test_distinctive_terms_come_from_the_users_own_messages():
+    df = make_chat()
+    users, centroids = similarity.user_centroids(vectorize_messages(df))
+    terms_df = similarity.distinctive_terms(users, centroids)
+
+    assert terms_df['user'].tolist() == users
+    for user, terms in zip(terms_df['user'], terms_df['distinctive_terms']):
+        vocabulary = set(tfidf.build_analyzer()(" ".join(df.loc[df['user'] == user, 'message']).lower()))
+        assert all(term in vocabulary for term in terms.split(', ') if term)